@@ -18,7 +18,7 @@ class ChatBox:
     After a certian amount of time (measured in seconds) messages fade away and are removed from the chat
     """
 
-    # TODO: should these arguments (and the message_to_tiem dict) be floats or ints
+    # TODO: should these arguments (and the message_times list) be floats or ints
 
     def __init__(
         self,
@@ -34,8 +34,9 @@ class ChatBox:
         self.rect = pygame.Rect(x, y, width, height)
         self.font = font
         self.time_on_screen = time_on_screen
-        self.message_to_time: dict[pygame.surface.Surface, float] = {}
+        # messages are oldest first, and message_times[i] is how long messages[i] has been shown for
         self.messages: list[pygame.surface.Surface] = []
+        self.message_times: list[float] = []
         self.curr_height = 0
 
     def add_message(self, message: str) -> None:
@@ -48,7 +49,7 @@ class ChatBox:
         if self.curr_height + message_height <= self.rect.height:
             self.curr_height += message_height
             self.messages.append(message_surface)
-            self.message_to_time[message_surface] = 0
+            self.message_times.append(0)
         # otherwise there is not enough space, so we
         # remove one element and try addining the message again?
         # recursively? what if it's still too big, well then their message is too long
@@ -66,12 +67,18 @@ class ChatBox:
 
     def update_message_times(self, time_since_last_frame: float) -> None:
         """Updates the amount of time that messages have been shown for, and deletes any messages that have been there for too long"""
-        to_be_removed = []
-        for message, time in self.message_to_time.items():
-            self.message_to_time[message] = time + time_since_last_frame
-            if self.message_to_time[message] / 1000 > self.time_on_screen:
-                to_be_removed.append(message)
+        self.message_times = [
+            time + time_since_last_frame for time in self.message_times
+        ]
 
-        for message in to_be_removed:
-            del self.message_to_time[message]
-            self.messages.remove(message)
+        # Every message is shown for the same amount of time, so expired messages are always the oldest
+        num_expired = 0
+        for time in self.message_times:
+            if time / 1000 <= self.time_on_screen:
+                break
+            num_expired += 1
+
+        for message in self.messages[:num_expired]:
+            self.curr_height -= message.get_height()
+        del self.messages[:num_expired]
+        del self.message_times[:num_expired]
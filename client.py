@@ -61,8 +61,18 @@ def server_listener(
     :param client_instance: the instance of the client
     :return:
     """
-    while True:  # TODO kill thread when client quits by checking flag
-        input_message = cast(message.ServerMessage, network.recv(socket))
+    # runs as a daemon thread, so it is killed when the client quits
+    while True:
+        try:
+            input_message = cast(message.ServerMessage, network.recv(socket))
+        except message.MessageTooLargeError:
+            # there's no telling where the next message starts, so there's no way to carry on
+            print("Lost track of the messages from the server")
+            client_instance.quit()
+            return
+        except (message.MalformedMessageError, message.UnknownMessageTypeError):
+            # the framing is still intact, so we can just skip this message
+            continue
         client_instance.process_input_message(input_message)
 
 
@@ -87,6 +97,19 @@ def initialize_network(
         raise message.UnknownMessageTypeError
 
 
+def initialize_input_socket(ip_address: str, port: int) -> socket.socket:
+    """
+    Player state is sent to the server over udp, the socket is connected so that it
+    only talks to the server
+
+    :param ip_address: the ip address of the server
+    :param port: the port of the server
+    """
+    input_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    input_socket.connect((ip_address, port))
+    return input_socket
+
+
 def run_client(args: argparse.Namespace) -> None:
     """
     Starts a client
@@ -94,16 +117,21 @@ def run_client(args: argparse.Namespace) -> None:
     :param args: command line arguments parsed by argparse
     """
     server_socket, server_join_message = initialize_network(args.ip_address, args.port)
+    input_socket = initialize_input_socket(args.ip_address, args.port)
 
     client_instance = ClientInstance(
         server_socket,
+        input_socket,
         server_join_message,
         args.fullscreen,
         args.frame_rate,
         args.sensitivity,
     )
 
-    t = Thread(target=server_listener, args=(server_socket, client_instance))
+    # daemon so that quitting doesn't hang waiting on a thread blocked in recv
+    t = Thread(
+        target=server_listener, args=(server_socket, client_instance), daemon=True
+    )
     t.start()
 
     running = True
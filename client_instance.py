@@ -22,11 +22,20 @@ from chatbox import ChatBox
 from typing import cast
 import simulation_object.constants
 
+# Looked up once here rather than on every frame
+BACKGROUND_COLOR = pygame.color.THECOLORS["black"]  # type: ignore
+AIM_COLOR = pygame.color.THECOLORS["orange"]  # type: ignore
+PROJECTILE_COLOR = pygame.color.THECOLORS["chartreuse4"]  # type: ignore
+TEXT_COLOR = pygame.Color("white")
+
+INPUT_PERIOD_MS = 1000 / game_engine_constants.CLIENT_INPUT_RATE_HZ
+
 
 class ClientInstance:
     def __init__(
         self,
         socket: socket.socket,
+        input_socket: socket.socket,
         server_join_message: ServerJoinMessage,
         fullscreen: bool,
         frame_rate: int,
@@ -35,7 +44,11 @@ class ClientInstance:
         self._setup_pygame(fullscreen)
 
         self.socket = socket
+        self.input_socket = input_socket
+        self.input_sequence = 0
+        self.time_since_input_sent: float = 0
         self.player_id = server_join_message.player_id
+        self.input_token = server_join_message.input_token
         self.map_name = server_join_message.map_name
         self.frame_rate = frame_rate
         self.set_sensitivity(sensitivity)
@@ -69,10 +82,14 @@ class ClientInstance:
 
         self.simulation_state: SimulationStateMessage | None = None
 
-        self.map = map_loading.load_map(self.map_name)
+        self._load_map(self.map_name)
 
         self.rotation: float = 0
 
+        # The health text only changes when we take damage, so it's only rendered then
+        self.health_text: str | None = None
+        self.health_surface: pygame.surface.Surface | None = None
+
     def _setup_pygame(self, fullscreen: bool) -> None:
         pygame.init()
         pygame.mixer.init()  # sound
@@ -102,6 +119,25 @@ class ClientInstance:
         pygame.mouse.set_visible(False)
         pygame.event.set_grab(True)
 
+        # The mouse and the movement keys are polled each frame, so the only events we
+        # need are these; keeping the rest out stops mouse motion flooding the queue.
+        # Text input has to be left in for key down events to know their unicode
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.TEXTINPUT])
+
+    def _load_map(self, map_name: str) -> None:
+        self.map = map_loading.load_map(map_name)
+
+        # The map never changes once loaded, so group every wall by color up front,
+        # that way drawing doesn't have to walk the partitions every frame
+        self.map_rects_by_color: dict[tuple[int, ...], list[pygame.Rect]] = {}
+        for row in self.map.partitioned_map:
+            for partition in row:
+                for wall in partition.walls + partition.bounding_walls:
+                    self.map_rects_by_color.setdefault(tuple(wall.color), []).append(
+                        wall.rect
+                    )
+
     def set_sensitivity(self, sensitivity: float) -> None:
         self.sensitivity = sensitivity * game_engine_constants.SENSITIVITY_SCALE
 
@@ -171,6 +207,8 @@ class ClientInstance:
 
         output_message = PlayerStateMessage(
             player_id=self.player_id,
+            input_token=self.input_token,
+            sequence=self.input_sequence,
             delta_position=pygame.math.Vector2(x_movement, y_movement),
             rotation=self.rotation,
             firing=firing,
@@ -179,7 +217,8 @@ class ClientInstance:
             map_vote=self.map_vote,
         )
 
-        network.send(self.socket, output_message)
+        network.send_player_state(self.input_socket, output_message)
+        self.input_sequence += 1
 
     def process_input_message(self, input_message: ServerMessage) -> None:
         """
@@ -200,7 +239,7 @@ class ClientInstance:
 
         elif type(input_message) == ServerMapChangeMessage:
             self.map_name = input_message.map_name
-            self.map = map_loading.load_map(self.map_name)
+            self._load_map(self.map_name)
             self.ready = False
             self.map_vote = None
             self.user_chat_box.add_message(f"Map changed to {input_message.map_name}")
@@ -208,9 +247,16 @@ class ClientInstance:
         else:
             raise UnknownMessageTypeError
 
-    def _update(self) -> None:
+    def _update(self, delta_time: float) -> None:
         self._process_pygame_events()
-        self.send_inputs()
+
+        # The server only steps at its tick rate, so sending more often than that is
+        # wasted work on both ends, mouse movement still builds up between sends
+        self.time_since_input_sent += delta_time
+        if self.time_since_input_sent >= INPUT_PERIOD_MS:
+            # after a slow frame the backlog is dropped rather than sent all at once
+            self.time_since_input_sent %= INPUT_PERIOD_MS
+            self.send_inputs()
 
     def _camera_view(self) -> pygame.math.Vector2:
         our_position = (
@@ -220,13 +266,24 @@ class ClientInstance:
         )
         return game_engine_constants.SCREEN_CENTER_POINT - our_position
 
-    def _draw_players(self) -> None:
+    def _draw_map(self, camera_view: pygame.math.Vector2) -> None:
+        # The part of the map that is on screen, in map coordinates
+        visible_area = self.screen.get_rect().move(-camera_view)
+        for color, rects in self.map_rects_by_color.items():
+            for i in visible_area.collidelistall(rects):
+                pygame.draw.rect(self.screen, color, rects[i].move(camera_view))
+
+    def _draw_players(self, camera_view: pygame.math.Vector2) -> None:
+        camera_x, camera_y = camera_view
         for player in self.simulation_state.players.values():
-            player_relative_position = player.position + self._camera_view()
+            player_relative_position = (
+                player.position.x + camera_x,
+                player.position.y + camera_y,
+            )
 
             pygame.draw.line(
                 self.screen,
-                pygame.color.THECOLORS["orange"],
+                AIM_COLOR,
                 player_relative_position,
                 (
                     player_relative_position[0]
@@ -247,44 +304,44 @@ class ClientInstance:
                 game_engine_constants.PLAYER_RADIUS,
             )
 
-    def _draw_rockets(self) -> None:
+    def _draw_rockets(self, camera_view: pygame.math.Vector2) -> None:
+        camera_x, camera_y = camera_view
+        # TODO use shared variable with server
+        radius = game_engine_constants.TILE_SIZE / 4
         for projectile in self.simulation_state.rockets.values():
-            # TODO use shared variable with server
-            radius = game_engine_constants.TILE_SIZE / 4
             pygame.draw.circle(
                 self.screen,
-                pygame.color.THECOLORS["chartreuse4"],
-                projectile.position + self._camera_view(),
+                PROJECTILE_COLOR,
+                (projectile.position.x + camera_x, projectile.position.y + camera_y),
                 radius,
             )
 
-    def _draw_hitscan_beams(self) -> None:
+    def _draw_hitscan_beams(self, camera_view: pygame.math.Vector2) -> None:
+        camera_x, camera_y = camera_view
         for hitscan_beam in self.simulation_state.hitscan_beams.values():
             pygame.draw.line(
                 self.screen,
-                pygame.color.THECOLORS["chartreuse4"],
-                hitscan_beam.start_point + self._camera_view(),
-                hitscan_beam.end_point + self._camera_view(),
+                PROJECTILE_COLOR,
+                (
+                    hitscan_beam.start_point.x + camera_x,
+                    hitscan_beam.start_point.y + camera_y,
+                ),
+                (
+                    hitscan_beam.end_point.x + camera_x,
+                    hitscan_beam.end_point.y + camera_y,
+                ),
             )
 
     def _render(self, delta_time: float) -> None:
-        self.screen.fill(pygame.color.THECOLORS["black"])  # type: ignore
+        self.screen.fill(BACKGROUND_COLOR)
 
-        for row in self.map.partitioned_map:
-            for partition in row:
-                for wall in partition.walls:
-                    pygame.draw.rect(
-                        self.screen, wall.color, wall.rect.move(self._camera_view())
-                    )
+        # everything is drawn relative to us, so only work that out once a frame
+        camera_view = self._camera_view()
 
-                for b_wall in partition.bounding_walls:
-                    pygame.draw.rect(
-                        self.screen, b_wall.color, b_wall.rect.move(self._camera_view())
-                    )
-
-        self._draw_players()
-        self._draw_rockets()
-        self._draw_hitscan_beams()
+        self._draw_map(camera_view)
+        self._draw_players(camera_view)
+        self._draw_rockets(camera_view)
+        self._draw_hitscan_beams(camera_view)
         self.leaderboard.render(
             self.player_id,
             list(cast(SimulationStateMessage, self.simulation_state).players.values()),
@@ -306,19 +363,20 @@ class ClientInstance:
             ),
         )
 
-        health_surface = self.font.render(
-            f"Health: {self._this_player().health}", False, pygame.Color("white")
-        )
+        health_text = f"Health: {self._this_player().health:g}"
+        if health_text != self.health_text:
+            self.health_text = health_text
+            self.health_surface = self.font.render(health_text, False, TEXT_COLOR)
         self.screen.blit(
-            health_surface,
-            (0, game_engine_constants.HEIGHT - health_surface.get_height()),
+            self.health_surface,
+            (0, game_engine_constants.HEIGHT - self.health_surface.get_height()),
         )
 
     def step(self) -> bool:
         delta_time = self.clock.tick(self.frame_rate)
 
         if self.simulation_state and self.player_id in self.simulation_state.players:
-            self._update()
+            self._update(delta_time)
             self._render(delta_time)
 
         pygame.display.flip()
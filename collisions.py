@@ -6,6 +6,9 @@ import game_engine_constants
 from body import Body
 from map_loading import BoundingWall
 
+# Collisions happen every tick, so everything here logs at debug level with lazy formatting
+logger = logging.getLogger(__name__)
+
 
 def elastic_collision_update(b1: Body, b2: Body) -> None:
     """
@@ -37,8 +40,6 @@ def elastic_collision_update(b1: Body, b2: Body) -> None:
         b1.velocity = v1_prime
         b2.velocity = v2_prime
 
-        print(v1_prime, v2_prime)
-
 
 def bodies_colliding(body_1: Body, body_2: Body) -> bool:
     p1, r1 = body_1.position, body_1.radius
@@ -122,14 +123,14 @@ def simulate_collision(body: Body, b_wall: BoundingWall) -> None:
     half_in = A or B
 
     if fully_in or half_in:
-        logging.info("body is inside")
+        logger.debug("body is inside")
         prev_pos = body.previous_position
         curr_pos = body.position
         # Then we use the previous position, and get it's closest position
         # Which is guarenteed to be neither half nor fully in
         # And use that to figure out what kind of it hit it is
         body.position = prev_pos
-        logging.info(closest_v.x, closest_v.y)
+        logger.debug("closest point %s %s", closest_v.x, closest_v.y)
         colliding = is_colliding_with_wall(body, b_wall)
         closest_v = get_closest_point_on_wall(body, b_wall)
         # assert colliding == False
@@ -203,13 +204,18 @@ def simulate_collision(body: Body, b_wall: BoundingWall) -> None:
 
     case_3 = [A3, B3, C3, D3]
 
-    logging.info(
-        f"fully_in: {fully_in},\n half_in: {half_in},\n case1: {case_1},\n case2: {case_2},\n case3: {case_3}"
+    logger.debug(
+        "fully_in: %s,\n half_in: %s,\n case1: %s,\n case2: %s,\n case3: %s",
+        fully_in,
+        half_in,
+        case_1,
+        case_2,
+        case_3,
     )
 
     if any(case_1):
         if A1:
-            logging.info("top right")
+            logger.debug("top right")
             rotated_vel = pygame.math.Vector2.rotate_rad(body.velocity, -math.tau / 8)
             rotated_vel.y *= -game_engine_constants.VELOCITY_REDUCTION_MODIFIER
             vel = pygame.math.Vector2.rotate_rad(rotated_vel, math.tau / 8)
@@ -221,7 +227,7 @@ def simulate_collision(body: Body, b_wall: BoundingWall) -> None:
             body.position = closest_v + r_v
 
         elif B1:
-            logging.info("bottom right")
+            logger.debug("bottom right")
             rotated_vel = pygame.math.Vector2.rotate_rad(body.velocity, math.tau / 8)
             rotated_vel.y *= -game_engine_constants.VELOCITY_REDUCTION_MODIFIER
             vel = pygame.math.Vector2.rotate_rad(rotated_vel, -math.tau / 8)
@@ -232,7 +238,7 @@ def simulate_collision(body: Body, b_wall: BoundingWall) -> None:
 
             body.position = closest_v + r_v
         elif C1:
-            logging.info("bottom left")
+            logger.debug("bottom left")
             rotated_vel = pygame.math.Vector2.rotate_rad(body.velocity, -math.tau / 8)
             rotated_vel.y *= -game_engine_constants.VELOCITY_REDUCTION_MODIFIER
             vel = pygame.math.Vector2.rotate_rad(rotated_vel, math.tau / 8)
@@ -244,7 +250,7 @@ def simulate_collision(body: Body, b_wall: BoundingWall) -> None:
             body.position = closest_v + r_v
 
         elif D1:
-            logging.info("top left")
+            logger.debug("top left")
             rotated_vel = pygame.math.Vector2.rotate_rad(body.velocity, math.tau / 8)
 
             rotated_vel.y *= -game_engine_constants.VELOCITY_REDUCTION_MODIFIER
@@ -315,16 +321,17 @@ def simulate_collision(body: Body, b_wall: BoundingWall) -> None:
                 game_engine_constants.VELOCITY_REDUCTION_MODIFIER,
             )
     else:
-        logging.info(
+        logger.debug(
             "a collision was detected - but for some reason we didn't do anything! - this is bad"
         )
         pass
 
-    logging.info(f"Body at {body.position.x} {body.position.y} after collision")
+    logger.debug("Body at %s %s after collision", body.position.x, body.position.y)
 
     end_collision_simulation_time = time.time()
-    logging.info(
-        f"==== WALL COLLISION SIMULATION END | TIME TAKEN: {end_collision_simulation_time - start_collision_simulation_time} ===="
+    logger.debug(
+        "==== WALL COLLISION SIMULATION END | TIME TAKEN: %s ====",
+        end_collision_simulation_time - start_collision_simulation_time,
     )
 
 
@@ -335,7 +342,7 @@ def right_reflect(
     closest_v: pygame.math.Vector2,
     velocity_reduction_multiplier: float,
 ) -> None:
-    logging.info("right")
+    logger.debug("right")
     body.velocity.x *= -1 * velocity_reduction_multiplier
     # Unstick player
     body.position = closest_v + pygame.math.Vector2(unstick_amount, 0)
@@ -347,7 +354,7 @@ def left_reflect(
     closest_v: pygame.math.Vector2,
     velocity_reduction_multiplier: float,
 ) -> None:
-    logging.info("left")
+    logger.debug("left")
     body.velocity.x *= -1 * velocity_reduction_multiplier
     # Unstick player
     body.position = closest_v + pygame.math.Vector2(-unstick_amount, 0)
@@ -359,7 +366,7 @@ def top_reflect(
     closest_v: pygame.math.Vector2,
     velocity_reduction_multiplier: float,
 ) -> None:
-    logging.info("top")
+    logger.debug("top")
     body.velocity.y *= -1 * velocity_reduction_multiplier
     # Unstick player
     body.position = closest_v + pygame.math.Vector2(0, -unstick_amount)
@@ -371,7 +378,7 @@ def bottom_reflect(
     closest_v: pygame.math.Vector2,
     velocity_reduction_multiplier: float,
 ) -> None:
-    logging.info("bottom")
+    logger.debug("bottom")
     body.velocity.y *= -1 * velocity_reduction_multiplier
     # Unstick player
     body.position = closest_v + pygame.math.Vector2(0, unstick_amount)
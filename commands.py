@@ -1,6 +1,6 @@
 from typing import Callable, Any
 from dataclasses import dataclass
-from comms.message import PlayerTextMessage
+from comms.message import MAX_MAP_VOTE_SIZE, PlayerTextMessage
 from comms import network
 
 
@@ -75,6 +75,13 @@ class CommandRunner:
 
     def map_vote(self, args: list[str]) -> None:
         map_vote = args[0]
+        # the vote is sent with every input, which only has room for so much of it
+        if len(map_vote.encode("utf-8")) > MAX_MAP_VOTE_SIZE:
+            self.client_instance.user_chat_box.add_message(
+                f"Map name {map_vote} is too long to vote for"
+            )
+            return
+
         self.client_instance.map_vote = map_vote
         # TODO this is bad
         text_message = PlayerTextMessage(
@@ -6,11 +6,28 @@ from network_object.player import PlayerNetworkObject
 from network_object.rocket import RocketNetworkObject
 from network_object.hitscan_beam import HitscanBeamNetworkObject
 
+# the number of bytes in the token a player proves their udp input is theirs with
+INPUT_TOKEN_SIZE = 16
+# player state has a fixed size, so a map vote can be at most this many bytes of utf-8
+MAX_MAP_VOTE_SIZE = 32
+
 
 class UnknownMessageTypeError(NotImplementedError):
     pass
 
 
+class MalformedMessageError(ValueError):
+    pass
+
+
+class MessageTooLargeError(MalformedMessageError):
+    """
+    The message's body is never read, so the rest of the stream can't be trusted
+    """
+
+    pass
+
+
 @dataclass
 class Message:
     pass
@@ -34,9 +51,16 @@ class ServerMessage(Message):
 
 @dataclass
 class PlayerStateMessage(ClientMessage):
-    """Represents client state sent to server."""
+    """
+    Represents client state sent to server.
+
+    These are sent over udp, so the sequence number lets the server drop any that arrive out of order,
+    and the input token from the player's ServerJoinMessage shows that they really are from that player
+    """
 
     player_id: UUID
+    input_token: bytes
+    sequence: int
     delta_position: pygame.math.Vector2
     rotation: float
     firing: bool
@@ -55,7 +79,12 @@ class PlayerTextMessage(ClientMessage):
 
 @dataclass
 class ServerJoinMessage(ServerMessage):
+    """
+    Sent only to the player who joined, so nobody else learns their input token
+    """
+
     player_id: UUID
+    input_token: bytes
     map_name: str
 
 
@@ -1,28 +1,352 @@
-from comms.message import Message
-import pickle
+from uuid import UUID
+
+from comms.message import (
+    INPUT_TOKEN_SIZE,
+    MAX_MAP_VOTE_SIZE,
+    MalformedMessageError,
+    Message,
+    MessageTooLargeError,
+    PlayerStateMessage,
+    PlayerTextMessage,
+    ServerJoinMessage,
+    ServerMapChangeMessage,
+    ServerStatusMessage,
+    SimulationStateMessage,
+    UnknownMessageTypeError,
+)
+from network_object.player import PlayerNetworkObject
+from network_object.rocket import RocketNetworkObject
+from network_object.hitscan_beam import HitscanBeamNetworkObject
+import pygame
 import socket
+import struct
+
+# A message on the wire is a 4 byte length, followed by a 1 byte tag and then the body,
+# the length counts the tag and the body.
+#
+# Simulation state is sent every tick so it gets a fixed layout, the other messages are
+# at most a uuid and an input token followed by a utf-8 string which runs to the end of
+# the body.
+#
+# Nothing is pickled, so a message from a peer can never run code when it's decoded.
+
+_SIMULATION_STATE_MESSAGE_TAG = 1
+_PLAYER_TEXT_MESSAGE_TAG = 2
+_SERVER_JOIN_MESSAGE_TAG = 3
+_SERVER_STATUS_MESSAGE_TAG = 4
+_SERVER_MAP_CHANGE_MESSAGE_TAG = 5
+
+_UUID_SIZE = 16
+
+_LENGTH_AND_TAG = struct.Struct("<IB")
+# The length comes from the peer, so it's checked before anything is allocated for the
+# body, this is far more than simulation state for any realistic number of players
+_MAX_MESSAGE_SIZE = 1 << 20
+
+# number of players, rockets and hitscan beams
+_SIMULATION_STATE_COUNTS = struct.Struct("<HHH")
+# uuid, x, y, rotation, weapon_selection, health, num_frags, r, g, b, a
+_PLAYER = struct.Struct("<16s3fBfI4B")
+# uuid, x, y
+_ROCKET = struct.Struct("<16s2f")
+# uuid, start x, start y, end x, end y
+_HITSCAN_BEAM = struct.Struct("<16s4f")
 
+# Player state is sent every frame as its own udp datagram, without the framing above
+# uuid, input token, sequence, delta x, delta y, rotation, firing, weapon_selection, ready,
+# map_vote
+_PLAYER_STATE = struct.Struct(f"<16s{INPUT_TOKEN_SIZE}sIbbf?B?{MAX_MAP_VOTE_SIZE}s")
 
-def _recv_exactly(socket: socket.socket, num_bytes: int) -> bytes:
-    data = b""
-    while len(data) < num_bytes:
-        chunk = socket.recv(num_bytes - len(data))
-        if not chunk:
+
+# Lets the kernel wait until the whole read has arrived, where the platform supports it
+_MSG_WAITALL = getattr(socket, "MSG_WAITALL", 0)
+
+
+def _recv_exactly(socket: socket.socket, num_bytes: int) -> bytearray:
+    data = bytearray(num_bytes)
+    view = memoryview(data)
+    num_received = 0
+    # even with MSG_WAITALL a read can come back short if it's interrupted
+    while num_received < num_bytes:
+        num_chunk_bytes = socket.recv_into(
+            view[num_received:], num_bytes - num_received, _MSG_WAITALL
+        )
+        if not num_chunk_bytes:
             raise ConnectionResetError
-        data += chunk  # TODO this is quadratic, should join instead
+        num_received += num_chunk_bytes
     return data
 
 
+def _encode_simulation_state(message: SimulationStateMessage) -> bytearray:
+    num_players = len(message.players)
+    num_rockets = len(message.rockets)
+    num_hitscan_beams = len(message.hitscan_beams)
+
+    size = (
+        _LENGTH_AND_TAG.size
+        + _SIMULATION_STATE_COUNTS.size
+        + num_players * _PLAYER.size
+        + num_rockets * _ROCKET.size
+        + num_hitscan_beams * _HITSCAN_BEAM.size
+    )
+    buffer = bytearray(size)
+
+    _LENGTH_AND_TAG.pack_into(buffer, 0, size - 4, _SIMULATION_STATE_MESSAGE_TAG)
+    offset = _LENGTH_AND_TAG.size
+    _SIMULATION_STATE_COUNTS.pack_into(
+        buffer, offset, num_players, num_rockets, num_hitscan_beams
+    )
+    offset += _SIMULATION_STATE_COUNTS.size
+
+    for player in message.players.values():
+        _PLAYER.pack_into(
+            buffer,
+            offset,
+            player.uuid.bytes,
+            player.position.x,
+            player.position.y,
+            player.rotation,
+            player.weapon_selection,
+            player.health,
+            player.num_frags,
+            *player.color,
+        )
+        offset += _PLAYER.size
+
+    for rocket in message.rockets.values():
+        _ROCKET.pack_into(
+            buffer, offset, rocket.uuid.bytes, rocket.position.x, rocket.position.y
+        )
+        offset += _ROCKET.size
+
+    for hitscan_beam in message.hitscan_beams.values():
+        _HITSCAN_BEAM.pack_into(
+            buffer,
+            offset,
+            hitscan_beam.uuid.bytes,
+            hitscan_beam.start_point.x,
+            hitscan_beam.start_point.y,
+            hitscan_beam.end_point.x,
+            hitscan_beam.end_point.y,
+        )
+        offset += _HITSCAN_BEAM.size
+
+    return buffer
+
+
+def _decode_simulation_state(body: memoryview) -> SimulationStateMessage:
+    num_players, num_rockets, num_hitscan_beams = _SIMULATION_STATE_COUNTS.unpack_from(
+        body
+    )
+    offset = _SIMULATION_STATE_COUNTS.size
+
+    # slicing past the end doesn't fail, so make sure everything counted is really there
+    if len(body) != (
+        offset
+        + num_players * _PLAYER.size
+        + num_rockets * _ROCKET.size
+        + num_hitscan_beams * _HITSCAN_BEAM.size
+    ):
+        raise MalformedMessageError
+
+    message = SimulationStateMessage()
+
+    players_end = offset + num_players * _PLAYER.size
+    for (
+        uuid_bytes,
+        x,
+        y,
+        rotation,
+        weapon_selection,
+        health,
+        num_frags,
+        *color,
+    ) in _PLAYER.iter_unpack(body[offset:players_end]):
+        player_id = UUID(bytes=uuid_bytes)
+        message.players[player_id] = PlayerNetworkObject(
+            uuid=player_id,
+            position=pygame.math.Vector2(x, y),
+            rotation=rotation,
+            weapon_selection=weapon_selection,
+            health=health,
+            num_frags=num_frags,
+            color=pygame.Color(*color),
+        )
+    offset = players_end
+
+    rockets_end = offset + num_rockets * _ROCKET.size
+    for uuid_bytes, x, y in _ROCKET.iter_unpack(body[offset:rockets_end]):
+        rocket_id = UUID(bytes=uuid_bytes)
+        message.rockets[rocket_id] = RocketNetworkObject(
+            uuid=rocket_id, position=pygame.math.Vector2(x, y)
+        )
+    offset = rockets_end
+
+    hitscan_beams_end = offset + num_hitscan_beams * _HITSCAN_BEAM.size
+    for uuid_bytes, start_x, start_y, end_x, end_y in _HITSCAN_BEAM.iter_unpack(
+        body[offset:hitscan_beams_end]
+    ):
+        hitscan_beam_id = UUID(bytes=uuid_bytes)
+        message.hitscan_beams[hitscan_beam_id] = HitscanBeamNetworkObject(
+            uuid=hitscan_beam_id,
+            start_point=pygame.math.Vector2(start_x, start_y),
+            end_point=pygame.math.Vector2(end_x, end_y),
+        )
+
+    return message
+
+
+def _frame(tag: int, body: bytes) -> bytes:
+    return _LENGTH_AND_TAG.pack(len(body) + 1, tag) + body
+
+
+def encode(message: Message) -> bytes | bytearray:
+    """
+    Frame a message so it can be written to any number of sockets with send_encoded
+    """
+    if type(message) is SimulationStateMessage:
+        return _encode_simulation_state(message)
+    elif type(message) is PlayerTextMessage:
+        return _frame(
+            _PLAYER_TEXT_MESSAGE_TAG,
+            message.player_id.bytes + message.text.encode("utf-8"),
+        )
+    elif type(message) is ServerJoinMessage:
+        return _frame(
+            _SERVER_JOIN_MESSAGE_TAG,
+            message.player_id.bytes
+            + message.input_token
+            + message.map_name.encode("utf-8"),
+        )
+    elif type(message) is ServerStatusMessage:
+        return _frame(_SERVER_STATUS_MESSAGE_TAG, message.status.encode("utf-8"))
+    elif type(message) is ServerMapChangeMessage:
+        return _frame(_SERVER_MAP_CHANGE_MESSAGE_TAG, message.map_name.encode("utf-8"))
+    else:
+        raise UnknownMessageTypeError(type(message))
+
+
+def _decode(tag: int, body: memoryview) -> Message:
+    if tag == _SIMULATION_STATE_MESSAGE_TAG:
+        return _decode_simulation_state(body)
+    elif tag == _PLAYER_TEXT_MESSAGE_TAG:
+        return PlayerTextMessage(
+            player_id=UUID(bytes=bytes(body[:_UUID_SIZE])),
+            text=str(body[_UUID_SIZE:], "utf-8"),
+        )
+    elif tag == _SERVER_JOIN_MESSAGE_TAG:
+        map_name_start = _UUID_SIZE + INPUT_TOKEN_SIZE
+        if len(body) < map_name_start:
+            raise MalformedMessageError
+        return ServerJoinMessage(
+            player_id=UUID(bytes=bytes(body[:_UUID_SIZE])),
+            input_token=bytes(body[_UUID_SIZE:map_name_start]),
+            map_name=str(body[map_name_start:], "utf-8"),
+        )
+    elif tag == _SERVER_STATUS_MESSAGE_TAG:
+        return ServerStatusMessage(status=str(body, "utf-8"))
+    elif tag == _SERVER_MAP_CHANGE_MESSAGE_TAG:
+        return ServerMapChangeMessage(map_name=str(body, "utf-8"))
+    else:
+        raise UnknownMessageTypeError(tag)
+
+
+def send_encoded(socket: socket.socket, encoded_message: memoryview) -> None:
+    socket.sendall(encoded_message)
+
+
 def send(socket: socket.socket, message: Message) -> None:
-    bytes = pickle.dumps(message)
-    num_message_bytes = len(bytes).to_bytes(4, "little")
+    send_encoded(socket, memoryview(encode(message)))
+
+
+def send_player_state(socket: socket.socket, player_state: PlayerStateMessage) -> None:
+    """
+    Send player state as a single datagram, the socket must be a connected udp socket
+
+    :raises ValueError: if the map vote is longer than MAX_MAP_VOTE_SIZE bytes
+    """
+    map_vote = player_state.map_vote.encode("utf-8") if player_state.map_vote else b""
+    # pack would silently cut the vote short, possibly in the middle of a character
+    if len(map_vote) > MAX_MAP_VOTE_SIZE:
+        raise ValueError(f"Map vote {player_state.map_vote} is too long")
+    socket.send(
+        _PLAYER_STATE.pack(
+            player_state.player_id.bytes,
+            player_state.input_token,
+            player_state.sequence,
+            int(player_state.delta_position.x),
+            int(player_state.delta_position.y),
+            player_state.rotation,
+            player_state.firing,
+            player_state.weapon_selection,
+            player_state.ready,
+            map_vote,
+        )
+    )
 
-    socket.sendall(num_message_bytes + bytes)
+
+def recv_player_state(
+    socket: socket.socket,
+) -> tuple[PlayerStateMessage, tuple[str, int]]:
+    """
+    Wait for the next player state datagram, returns it along with the address it came from
+
+    :raises MalformedMessageError: if the datagram isn't a player state
+    """
+    # ask for one byte more than we expect so that oversized datagrams aren't silently truncated
+    datagram, address = socket.recvfrom(_PLAYER_STATE.size + 1)
+    try:
+        (
+            uuid_bytes,
+            input_token,
+            sequence,
+            delta_x,
+            delta_y,
+            rotation,
+            firing,
+            weapon_selection,
+            ready,
+            map_vote,
+        ) = _PLAYER_STATE.unpack(datagram)
+        map_vote = map_vote.rstrip(b"\0").decode("utf-8")
+    except (struct.error, UnicodeDecodeError) as e:
+        raise MalformedMessageError from e
+
+    player_state = PlayerStateMessage(
+        player_id=UUID(bytes=uuid_bytes),
+        input_token=input_token,
+        sequence=sequence,
+        delta_position=pygame.math.Vector2(delta_x, delta_y),
+        rotation=rotation,
+        firing=firing,
+        weapon_selection=weapon_selection,
+        ready=ready,
+        map_vote=map_vote or None,
+    )
+    return player_state, address
 
 
 def recv(socket: socket.socket) -> Message:
+    """
+    Wait for the next message
+
+    :raises MalformedMessageError: if the message's body doesn't match its tag
+    :raises UnknownMessageTypeError: if the message's tag isn't known
+    :raises MessageTooLargeError: if the message is longer than _MAX_MESSAGE_SIZE
+    """
     num_message_bytes_as_bytes = _recv_exactly(socket, 4)
     num_message_bytes = int.from_bytes(num_message_bytes_as_bytes, "little")
+    # every message has at least a tag, an empty one has nothing to decode
+    if num_message_bytes < 1:
+        raise MalformedMessageError
+    if num_message_bytes > _MAX_MESSAGE_SIZE:
+        raise MessageTooLargeError(num_message_bytes)
 
     message_as_bytes = _recv_exactly(socket, num_message_bytes)
-    return pickle.loads(message_as_bytes)
+    tag, body = message_as_bytes[0], memoryview(message_as_bytes)[1:]
+
+    try:
+        return _decode(tag, body)
+    except (struct.error, ValueError) as e:
+        # UnicodeDecodeError and a uuid of the wrong size are both ValueErrors
+        raise MalformedMessageError from e
@@ -12,6 +12,10 @@ HEIGHT = 1080
 
 FPS = 60
 SERVER_TICK_RATE_HZ = 60
+# Unchanged simulation state is only resent once this many ticks have passed
+SERVER_HEARTBEAT_TICKS = SERVER_TICK_RATE_HZ
+# Player state is sent at this rate no matter how fast the client renders
+CLIENT_INPUT_RATE_HZ = SERVER_TICK_RATE_HZ
 
 DEFAULT_SENSITIVITY = 2
 SENSITIVITY_SCALE = 1 / 1000
@@ -33,8 +37,6 @@ WEAPON_KEYS = [pygame.K_c, pygame.K_x, pygame.K_f]
 
 MAX_SPEED = 1500
 
-BUF_SIZE = 2**12
-
 TILE_SIZE = 32
 PLAYER_RADIUS = TILE_SIZE // 2
 MAP_BASE_DIM_X = 160
@@ -1,4 +1,9 @@
+from threading import RLock
 from typing import Any
 
-
 SIMULATION: Any = None
+
+# Held while SIMULATION's players are changed or SIMULATION is replaced, so that
+# players joining or leaving from other threads aren't lost. Reading the players
+# doesn't need it because the dict is swapped for an updated copy instead of mutated
+PLAYERS_LOCK = RLock()
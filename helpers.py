@@ -4,12 +4,6 @@ import game_engine_constants
 import math
 import pygame
 
-import math
-
-import pygame.math
-
-import game_engine_constants
-
 
 def polar_to_cartesian(radius: int, angle: float) -> tuple[float, float]:
     return math.cos(angle) * radius, math.sin(angle) * radius
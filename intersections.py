@@ -1,11 +1,11 @@
-from typing import Any
+from typing import Any, Iterable
 
 import game_engine_constants, helpers
 import pygame, math
 
 
 from simulation_object.simulation_object import SimulationObject
-from map_loading import PartitionedMapGrid, BoundingWall
+from map_loading import PartitionedMapGrid, MapGridPartition, BoundingWall
 
 
 # NOTE: player and beam can't be typed more strictly without creating a dependancy cycle
@@ -14,6 +14,7 @@ def get_closest_intersecting_object_in_pmg(
     partitioned_map_grid: PartitionedMapGrid,
     beam: Any,
     applies_force_to_player: bool,
+    partitions: Iterable[MapGridPartition] | None = None,
 ) -> tuple[pygame.math.Vector2 | None, SimulationObject | None]:
     """
     Given a beam that is passing through a given map fired by player , find the closest element to it which is not player
@@ -21,6 +22,7 @@ def get_closest_intersecting_object_in_pmg(
     :param player:
     :param partitioned_map_grid:
     :param beam:
+    :param partitions: partitions containing everything the beam could hit, worked out from the beam if not given
     :return: TODO change to None or the tuple
     """
     closest_hit = None
@@ -42,12 +44,13 @@ def get_closest_intersecting_object_in_pmg(
                 closest_entity = entity
         return closest_hit, closest_entity
 
-    intersected_partitions = get_intersecting_partitions(
-        partitioned_map_grid,
-        beam,
-    )
+    if partitions is None:
+        partitions = get_intersecting_partitions(
+            partitioned_map_grid,
+            beam,
+        )
 
-    for partition in intersected_partitions:
+    for partition in partitions:
         hit, entity = get_closest_intersecting_object_in_partition(
             player, beam, partition, applies_force_to_player
         )
@@ -63,6 +66,46 @@ def get_closest_intersecting_object_in_pmg(
     return closest_hit, closest_entity
 
 
+def get_partitions_in_area(
+    partitioned_map_grid: PartitionedMapGrid,
+    top: float,
+    left: float,
+    bottom: float,
+    right: float,
+) -> list[MapGridPartition]:
+    """
+    Return the partitions that overlap with the given area, any of the area outside of the map is ignored
+
+    :param partitioned_map_grid: the map the area is in
+    :param top: the top of the area
+    :param left: the left of the area
+    :param bottom: the bottom of the area
+    :param right: the right of the area
+    """
+    first_idx_x, first_idx_y = helpers.get_partition_index(
+        partitioned_map_grid.partition_width,
+        partitioned_map_grid.partition_height,
+        (left, top),
+    )
+    last_idx_x, last_idx_y = helpers.get_partition_index(
+        partitioned_map_grid.partition_width,
+        partitioned_map_grid.partition_height,
+        (right, bottom),
+    )
+
+    return [
+        partitioned_map_grid.partitioned_map[idx_y][idx_x]
+        for idx_y in range(
+            max(first_idx_y, 0),
+            min(last_idx_y, partitioned_map_grid.num_y_partitions - 1) + 1,
+        )
+        for idx_x in range(
+            max(first_idx_x, 0),
+            min(last_idx_x, partitioned_map_grid.num_x_partitions - 1) + 1,
+        )
+    ]
+
+
 # NOTE: beam can't be typed more strictly without creating a dependancy cycle
 def get_intersecting_partitions(
     partitioned_map_grid: PartitionedMapGrid, beam: Any
@@ -395,14 +438,23 @@ def get_closest_intersecting_object_in_partition(
 
     fire_slope = beam.slope
 
-    for b_wall in pmg.bounding_walls:
+    # Any hit has to lie on the beam, so walls outside of the beam's bounding box can be skipped
+    beam_top = min(beam.start_point.y, beam.end_point.y)
+    beam_left = min(beam.start_point.x, beam.end_point.x)
+    beam_bottom = max(beam.start_point.y, beam.end_point.y)
+    beam_right = max(beam.start_point.x, beam.end_point.x)
+
+    for b_wall, (top, left, bottom, right) in zip(
+        pmg.bounding_walls, pmg.bounding_wall_extents
+    ):
+        if (
+            right < beam_left
+            or left > beam_right
+            or bottom < beam_top
+            or top > beam_bottom
+        ):
+            continue
 
-        top, left, bottom, right = (
-            b_wall.rect.top,
-            b_wall.rect.left,
-            b_wall.rect.bottom,
-            b_wall.rect.right,
-        )
         translated_top, translated_left, translated_bottom, translated_right = (
             top - fire_origin.y,
             left - fire_origin.x,
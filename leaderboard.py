@@ -2,6 +2,9 @@ from uuid import UUID
 from network_object.player import PlayerNetworkObject
 import pygame
 
+ROW_COLOR = pygame.Color("white")
+OUR_ROW_COLOR = pygame.Color("gold")
+
 
 class Leaderboard:
     def __init__(
@@ -16,6 +19,8 @@ class Leaderboard:
         self.screen = screen
         self.rect = pygame.Rect(x, y, width, height)
         self.font = font
+        # Rendering text is expensive and rows rarely change, so keep the surfaces from the last render
+        self.rendered_rows: dict[tuple[str, bool], pygame.surface.Surface] = {}
 
     def _make_leaderboard_row(self, player: PlayerNetworkObject) -> str:
         return f"{str(player.uuid)[:4]}: {player.num_frags}"
@@ -23,11 +28,19 @@ class Leaderboard:
     def render(self, our_player_id: UUID, players: list[PlayerNetworkObject]) -> None:
         players.sort(key=lambda player: player.num_frags, reverse=True)
 
+        rendered_rows = {}
         height = self.rect.y
         for player in players:
             text = self._make_leaderboard_row(player)
-            color = "white" if player.uuid != our_player_id else "gold"
-            row = self.font.render(text, False, pygame.Color(color))
+            is_us = player.uuid == our_player_id
+            row = self.rendered_rows.get((text, is_us))
+            if row is None:
+                color = OUR_ROW_COLOR if is_us else ROW_COLOR
+                row = self.font.render(text, False, color)
+            rendered_rows[(text, is_us)] = row
             height += row.get_height()
             text_pos = (self.rect.x, height)
             self.screen.blit(row, text_pos)
+
+        # Only hold on to rows that are still on the leaderboard
+        self.rendered_rows = rendered_rows
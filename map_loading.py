@@ -293,6 +293,13 @@ class MapGridPartition:
                 ):  # it's a spawn TODO make spawn class and switch on that
                     self.spawns.append(data)
 
+        # The top, left, bottom and right of each bounding wall in the same order as bounding_walls,
+        # beams test against every bounding wall in a partition so this saves going through the rects
+        self.bounding_wall_extents = [
+            (b_wall.rect.top, b_wall.rect.left, b_wall.rect.bottom, b_wall.rect.right)
+            for b_wall in self.bounding_walls
+        ]
+
 
 def is_wall(x: int, y: int, pixel_map: list[list[int]]) -> bool:
     color = pixel_map[y][x]
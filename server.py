@@ -1,6 +1,8 @@
 import socket
 import argparse
+import secrets
 
+from collections import deque
 from queue import Queue
 from threading import Thread
 
@@ -12,42 +14,114 @@ from simulation import Simulation
 import global_simulation
 
 
-def listener(server_socket: socket.socket, state_queue: Queue[message.Message]) -> None:
+def listener(server_socket: socket.socket) -> None:
     while True:
         client_socket, addr = server_socket.accept()
-        player_id = global_simulation.SIMULATION.add_player(client_socket)
+        # the simulation could be replaced by a map change, so only look it up under the lock
+        with global_simulation.PLAYERS_LOCK:
+            player_id = global_simulation.SIMULATION.add_player(client_socket)
+            player = global_simulation.SIMULATION.players[player_id]
         network.send(
             client_socket,
             message.ServerJoinMessage(
-                player_id=player_id, map_name=global_simulation.SIMULATION.map_name
+                player_id=player_id,
+                input_token=player.input_token,
+                map_name=global_simulation.SIMULATION.map_name,
             ),
         )
         print(f"Accepted connection from {addr}")
 
-        t = Thread(target=client_listener, args=(client_socket, state_queue))
+        t = Thread(
+            target=client_listener,
+            args=(client_socket, player.input_messages),
+            daemon=True,
+        )
         t.start()
 
 
 def client_listener(
-    socket: socket.socket, input_messages: Queue[message.Message]
+    client_socket: socket.socket, input_messages: deque[message.ClientMessage]
 ) -> None:
     while True:
         try:
-            input_messages.put(network.recv(socket))
+            input_message = network.recv(client_socket)
+        except message.MessageTooLargeError:
+            # We can't find where the next message starts, so hang up on them, the
+            # messager removes the player once sending to them fails
+            client_socket.shutdown(socket.SHUT_RDWR)
+            exit()
+        except (message.MalformedMessageError, message.UnknownMessageTypeError):
+            # the framing is still intact, so we can just skip this message
+            continue
         except ConnectionResetError:
             exit()
 
+        # Player state comes in over udp, so text is the only thing a client sends here,
+        # anything else is a server message which the simulation wouldn't know what to do with
+        if type(input_message) is message.PlayerTextMessage:
+            input_messages.append(input_message)
+
+
+def input_listener(input_socket: socket.socket) -> None:
+    """
+    Receives player state datagrams and hands the newest one for each player to the simulation
+    """
+    while True:
+        try:
+            player_state, address = network.recv_player_state(input_socket)
+        except message.MalformedMessageError:
+            continue
+
+        player = global_simulation.SIMULATION.players.get(player_state.player_id)
+        # every player's uuid is public, so the token is what shows this is really them
+        if player is None or not secrets.compare_digest(
+            player_state.input_token, player.input_token
+        ):
+            continue
+
+        # the first genuine datagram ties the player to the address it came from
+        if player.input_address is None:
+            player.input_address = address
+        elif address != player.input_address:
+            continue
+
+        # udp doesn't guarantee order, anything older than what we've seen is stale
+        if player_state.sequence <= player.last_input_sequence:
+            continue
+
+        player.last_input_sequence = player_state.sequence
+        player.pending_inputs.append(player_state)
+
 
 def server_messager(output_messages: Queue[message.Message]) -> None:
+    last_encoded_state = None
+    ticks_since_state_sent = 0
     while True:
-        if not output_messages.empty():
-            message = output_messages.get()
-            players = global_simulation.SIMULATION.get_players()
-            for player in players:
-                try:
-                    network.send(player.socket, message)
-                except BrokenPipeError:
-                    print(f"Player {player} forcibly disconnected!")
+        output_message = output_messages.get()
+        # every player gets the same bytes, so only encode the message once
+        encoded_message = network.encode(output_message)
+
+        if type(output_message) is message.SimulationStateMessage:
+            # When nobody is doing anything the state doesn't change from tick to tick,
+            # so only resend identical state every so often
+            if (
+                encoded_message == last_encoded_state
+                and ticks_since_state_sent
+                < game_engine_constants.SERVER_HEARTBEAT_TICKS
+            ):
+                ticks_since_state_sent += 1
+                continue
+            last_encoded_state = encoded_message
+            ticks_since_state_sent = 0
+
+        encoded_message_view = memoryview(encoded_message)
+        players = global_simulation.SIMULATION.get_players()
+        for player in players:
+            try:
+                network.send_encoded(player.socket, encoded_message_view)
+            except BrokenPipeError:
+                print(f"Player {player} forcibly disconnected!")
+                with global_simulation.PLAYERS_LOCK:
                     global_simulation.SIMULATION.remove_player(player)
 
 
@@ -83,20 +157,34 @@ def initialize_socket() -> socket.socket:
     return server_socket
 
 
+def initialize_input_socket() -> socket.socket:
+    """
+    Player state comes in over udp on the same port number as the tcp server
+    """
+    input_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    ip_address = "localhost" if args.local else ""
+
+    input_socket.bind((ip_address, args.port))
+
+    return input_socket
+
+
 def load_requested_map(
     map_name: str | None,
     invalid_map_names: set[str],
-    input_messages: Queue[message.Message],
     output_messages: Queue[message.Message],
 ) -> bool:
     if map_name in invalid_map_names:
         return False
 
-    players = global_simulation.SIMULATION.players
     try:
-        global_simulation.SIMULATION = Simulation(
-            map_name, input_messages, output_messages, players=players
-        )
+        # players can't join or leave between being handed over and the new simulation
+        # taking over, otherwise the change would only happen in the old one
+        with global_simulation.PLAYERS_LOCK:
+            players = global_simulation.SIMULATION.players
+            global_simulation.SIMULATION = Simulation(
+                map_name, output_messages, players=players
+            )
     except FileNotFoundError:
         print(f"Could not load requested map {map_name}")
         invalid_map_names.add(map_name)
@@ -107,35 +195,40 @@ def load_requested_map(
 
 
 def run_server(args: argparse.Namespace) -> None:
-    input_messages: Queue[message.Message] = Queue()
     output_messages: Queue[message.Message] = Queue()
 
-    global_simulation.SIMULATION = Simulation(args.map, input_messages, output_messages)
+    global_simulation.SIMULATION = Simulation(args.map, output_messages)
 
     server_socket = initialize_socket()
+    input_socket = initialize_input_socket()
 
     tsa_t = Thread(
         target=listener,
-        args=(
-            server_socket,
-            input_messages,
-        ),
+        args=(server_socket,),
+        daemon=True,
     )
     tsa_t.start()
 
+    il_t = Thread(
+        target=input_listener,
+        args=(input_socket,),
+        daemon=True,
+    )
+    il_t.start()
+
     gss_t = Thread(
         target=server_messager,
         args=(output_messages,),
+        daemon=True,
     )
     gss_t.start()
 
+    # the threads above are all daemons, so stopping this loop stops the server
     invalid_map_names: set[str] = set()
     while True:
         keep_map, requested_map_name = global_simulation.SIMULATION.step()
         if not keep_map:
-            load_requested_map(
-                requested_map_name, invalid_map_names, input_messages, output_messages
-            )
+            load_requested_map(requested_map_name, invalid_map_names, output_messages)
 
 
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ import socket
 
 import collisions
 import game_engine_constants
+import global_simulation
 import helpers
 import map_loading
 import random
@@ -28,13 +29,11 @@ class Simulation:
     def __init__(
         self,
         map_name: str,
-        input_messages: Queue,
         output_messages: Queue,
         players: dict[UUID, Player] = {},
     ):
         self.map_name = map_name
         self.map = map_loading.load_map(map_name)
-        self.input_messages = input_messages
         self.output_messages = output_messages
         self.clock = pygame.time.Clock()
         self.active = False
@@ -46,8 +45,8 @@ class Simulation:
         self.rockets: dict[UUID, Rocket] = {}
         self.hitscan_beams: dict[UUID, HitscanBeam] = {}
 
+        # players are stored separately, see register_object
         self.type_to_dict = {
-            Player: self.players,
             Rocket: self.rockets,
             HitscanBeam: self.hitscan_beams,
         }
@@ -97,12 +96,32 @@ class Simulation:
         )
 
     def register_object(self, object: SimulationObject) -> None:
+        if type(object) is Player:
+            # Players join from the listener thread while step is reading them,
+            # so rather than mutating the dict we swap in an updated copy
+            with global_simulation.PLAYERS_LOCK:
+                if object.uuid in self.players:
+                    raise Exception("Object {object} registered twice!")
+                self.players = {**self.players, object.uuid: object}
+            return
+
         target_dict = self.type_to_dict[type(object)]
         if object.uuid in target_dict:  # type: ignore
             raise Exception("Object {object} registered twice!")
         target_dict[object.uuid] = object  # type: ignore
 
     def deregister_object(self, object: SimulationObject) -> None:
+        if type(object) is Player:
+            with global_simulation.PLAYERS_LOCK:
+                if object.uuid not in self.players:
+                    raise Exception("Object {object} not found while deregistering!")
+                self.players = {
+                    uuid: player
+                    for uuid, player in self.players.items()
+                    if uuid != object.uuid
+                }
+            return
+
         target_dict = self.type_to_dict[type(object)]
         if object.uuid not in target_dict:  # type: ignore
             raise Exception("Object {object} not found while deregistering!")
@@ -233,8 +252,24 @@ class Simulation:
 
         self.clear_partitions()
 
-        while not self.input_messages.empty():
-            self._process_input_message(self.input_messages.get())
+        # each player's listener thread only ever appends, and we are the only
+        # consumer, so the deques can be drained without locking
+        for player in self.players.values():
+            input_messages = player.input_messages
+            while input_messages:
+                self._process_input_message(input_messages.popleft())
+
+            pending_inputs = player.pending_inputs
+            if pending_inputs:
+                # Only the newest input is worth simulating, but a shot fired in
+                # one of the older ones still has to happen
+                player_state = pending_inputs.popleft()
+                firing = player_state.firing
+                while pending_inputs:
+                    player_state = pending_inputs.popleft()
+                    firing = firing or player_state.firing
+                player_state.firing = firing
+                self._process_input_message(player_state)
 
         # it's possible for an object to deregister itself during step,
         # so these could change size during iteration
@@ -5,6 +5,9 @@ PLAYER_HEALTH = 100
 
 PLAYER_AIM_LENGTH = 100
 
+# At most this many unsimulated inputs are kept per player, older ones are dropped
+PLAYER_INPUT_BACKLOG = 8
+
 PLAYER_DEATH_COLOR = pygame.color.THECOLORS["red"]  # type: ignore
 # TODO this is bad
 PLAYER_COLORS = [(r, g, b, a) for r, g, b, a in pygame.color.THECOLORS.values() if r + g + b > 300 and abs(r - g) + abs(g - b) + abs(b - r) > 50 and (r, g, b, a) != PLAYER_DEATH_COLOR]  # type: ignore
@@ -1,9 +1,11 @@
+from functools import cached_property
 from typing import Any
+import math
 import pygame
 
 import global_simulation
-import helpers
 import intersections
+import map_loading
 
 from network_object.network_object import NetworkObject
 from network_object.hitscan_beam import HitscanBeamNetworkObject
@@ -23,6 +25,7 @@ class HitscanBeam(SimulationObject):
         collision_force: int = weapons.constants.RAILGUN_COLLISION_FORCE,
         damage: int = weapons.constants.RAILGUN_DAMAGE,
         applies_force_to_player: bool = False,
+        partitions: list[map_loading.MapGridPartition] | None = None,
     ):
         """
         Set up a hitscan beam which is owned by a player
@@ -32,6 +35,7 @@ class HitscanBeam(SimulationObject):
         :param collision_force: The amount of force that this beam applies to what it hits
         :param damage: The amount of damage this beam will do to what it hits
         :param applies_force_to_player: If this beam can apply a force to the owner
+        :param partitions: Partitions containing everything the beam could hit, if they're already known
         """
         super().__init__()
 
@@ -40,8 +44,13 @@ class HitscanBeam(SimulationObject):
         self.delta_x = end_point[0] - start_point[0]
 
         self.applies_force_to_player = applies_force_to_player
+        self.partitions = partitions
 
-        self.direction_vector = (end_point - start_point).normalize()
+        # Plain floats are much cheaper than vectors, and explosions create lots of beams
+        self.length = math.hypot(self.delta_x, self.delta_y)
+        inverse_length = 1 / self.length if self.length else 0.0
+        self.direction_x = self.delta_x * inverse_length
+        self.direction_y = self.delta_y * inverse_length
 
         self.start_point = start_point
         self.end_point = end_point
@@ -50,13 +59,18 @@ class HitscanBeam(SimulationObject):
 
         self.collision_force = collision_force
 
-        self.slope = helpers.get_slope(start_point, end_point)
+        self.slope = self.delta_y / self.delta_x if self.delta_x else math.inf
 
         self.quadrant_info = (
-            helpers.get_sign(self.delta_x),
-            helpers.get_sign(self.delta_y),
+            1 if self.delta_x >= 0 else -1,
+            1 if self.delta_y >= 0 else -1,
         )
 
+    @cached_property
+    def direction_vector(self) -> pygame.math.Vector2:
+        """A unit vector pointing from the start point to the end point"""
+        return pygame.math.Vector2(self.direction_x, self.direction_y)
+
     def to_network_object(self) -> NetworkObject:
         return HitscanBeamNetworkObject(
             uuid=self.uuid,
@@ -65,6 +79,10 @@ class HitscanBeam(SimulationObject):
         )
 
     def step(self, _: float) -> None:
+        # a beam with no length has no direction to fire in, so it can't hit anything
+        if self.length == 0:
+            return
+
         (
             closest_hit,
             closest_entity,
@@ -73,6 +91,7 @@ class HitscanBeam(SimulationObject):
             global_simulation.SIMULATION.map,
             self,
             self.applies_force_to_player,
+            self.partitions,
         )
 
         if closest_hit is not None and closest_entity is not None:
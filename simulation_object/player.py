@@ -1,10 +1,12 @@
+from collections import deque
+import secrets
 from weapons.weapon import HitscanBeam
 import pygame
 import random
 import socket
 import collisions
 import global_simulation
-from comms.message import PlayerStateMessage
+from comms.message import INPUT_TOKEN_SIZE, ClientMessage, PlayerStateMessage
 import game_engine_constants
 import body
 from simulation_object import constants
@@ -28,6 +30,18 @@ class Player(SimulationObject, body.ConstantAccelerationBody):
         self.time_of_death = None
 
         self.socket = socket
+        # filled by this player's listener thread and drained by the simulation
+        self.input_messages: deque[ClientMessage] = deque()
+        # filled by the input listener thread and coalesced into one input each tick,
+        # a full deque just drops the oldest input
+        self.pending_inputs: deque[PlayerStateMessage] = deque(
+            maxlen=constants.PLAYER_INPUT_BACKLOG
+        )
+        self.last_input_sequence = -1
+        # only this player is told the token, and their input has to come from the address
+        # it was first used from
+        self.input_token = secrets.token_bytes(INPUT_TOKEN_SIZE)
+        self.input_address: tuple[str, int] | None = None
 
         self.rotation = 0
 
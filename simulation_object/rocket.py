@@ -1,8 +1,11 @@
 from abc import ABC
+import functools
 import math
 
 import collisions
+import game_engine_constants
 import global_simulation
+import intersections
 from network_object.rocket import RocketNetworkObject
 
 import pygame
@@ -16,6 +19,21 @@ from weapons.weapon import HitscanBeam
 from typing import Any
 
 
+@functools.cache
+def _shard_offsets(num_shards: int) -> tuple[tuple[float, float], ...]:
+    """
+    Where each shard of an explosion ends relative to the explosion, this only depends on
+    the number of shards so it's only ever computed once
+    """
+    angle_fraction = math.tau / num_shards
+    return tuple(
+        helpers.polar_to_cartesian(
+            constants.ROCKET_EXPLOSION_RADIUS, angle_fraction * i
+        )
+        for i in range(num_shards)
+    )
+
+
 class Rocket(SimulationObject, ConstantVelocityBody):
     """
     A rocket is a type of projectile which moves with constant velocity, it's payload is an explosion
@@ -49,12 +67,17 @@ class Rocket(SimulationObject, ConstantVelocityBody):
         self.num_shards = num_shards
 
     def explode(self, position: pygame.math.Vector2) -> None:
-        angle_fraction = math.tau / self.num_shards
-        for i in range(self.num_shards):
-            angle = angle_fraction * i
-            x, y = helpers.polar_to_cartesian(constants.ROCKET_EXPLOSION_RADIUS, angle)
-            relative_shard_vec = pygame.math.Vector2(x, y)
-            shard_vec = relative_shard_vec + position
+        x, y = position
+
+        # Every shard starts here and is at most the explosion radius long, so anything they
+        # could hit is in the partitions around the explosion, which only need finding once
+        reach = constants.ROCKET_EXPLOSION_RADIUS + game_engine_constants.PLAYER_RADIUS
+        partitions = intersections.get_partitions_in_area(
+            global_simulation.SIMULATION.map, y - reach, x - reach, y + reach, x + reach
+        )
+
+        for offset_x, offset_y in _shard_offsets(self.num_shards):
+            shard_vec = pygame.math.Vector2(x + offset_x, y + offset_y)
             HitscanBeam(
                 self.player,
                 position,
@@ -62,6 +85,7 @@ class Rocket(SimulationObject, ConstantVelocityBody):
                 weapons.constants.ROCKET_EXPLOSION_COLLISION_FORCE,
                 weapons.constants.ROCKET_EXPLOSION_DAMAGE,
                 applies_force_to_player=True,
+                partitions=partitions,
             )  # note this adds it to the simulation
         global_simulation.SIMULATION.deregister_object(self)
 
@@ -0,0 +1,266 @@
+import socket
+import struct
+from collections.abc import Iterator
+from uuid import uuid4
+
+import pygame
+import pytest
+
+from comms import network
+from comms.message import (
+    INPUT_TOKEN_SIZE,
+    MAX_MAP_VOTE_SIZE,
+    MalformedMessageError,
+    Message,
+    MessageTooLargeError,
+    PlayerStateMessage,
+    PlayerTextMessage,
+    ServerJoinMessage,
+    ServerMapChangeMessage,
+    ServerStatusMessage,
+    SimulationStateMessage,
+    UnknownMessageTypeError,
+)
+from network_object.hitscan_beam import HitscanBeamNetworkObject
+from network_object.player import PlayerNetworkObject
+from network_object.rocket import RocketNetworkObject
+
+
+@pytest.fixture
+def stream_sockets() -> Iterator[tuple[socket.socket, socket.socket]]:
+    sender, receiver = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    with sender, receiver:
+        yield sender, receiver
+
+
+@pytest.fixture
+def datagram_sockets() -> Iterator[tuple[socket.socket, socket.socket]]:
+    sender, receiver = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    with sender, receiver:
+        yield sender, receiver
+
+
+def make_simulation_state() -> SimulationStateMessage:
+    # every float can be represented exactly in 32 bits, so the state survives the round trip
+    player_id, rocket_id, hitscan_beam_id = uuid4(), uuid4(), uuid4()
+    return SimulationStateMessage(
+        players={
+            player_id: PlayerNetworkObject(
+                uuid=player_id,
+                position=pygame.math.Vector2(100.5, 200.25),
+                rotation=1.5,
+                weapon_selection=2,
+                health=87.5,
+                num_frags=3,
+                color=pygame.Color(10, 20, 30, 255),
+            )
+        },
+        rockets={
+            rocket_id: RocketNetworkObject(
+                uuid=rocket_id, position=pygame.math.Vector2(-4.0, 8.0)
+            )
+        },
+        hitscan_beams={
+            hitscan_beam_id: HitscanBeamNetworkObject(
+                uuid=hitscan_beam_id,
+                start_point=pygame.math.Vector2(0.0, 0.0),
+                end_point=pygame.math.Vector2(64.0, -32.0),
+            )
+        },
+    )
+
+
+def make_player_state(map_vote: str | None = "dm_s2") -> PlayerStateMessage:
+    return PlayerStateMessage(
+        player_id=uuid4(),
+        input_token=bytes(range(INPUT_TOKEN_SIZE)),
+        sequence=41,
+        delta_position=pygame.math.Vector2(1, -1),
+        rotation=0.5,
+        firing=True,
+        weapon_selection=1,
+        ready=True,
+        map_vote=map_vote,
+    )
+
+
+def frame(tag: int, body: bytes) -> bytes:
+    return struct.pack("<IB", len(body) + 1, tag) + body
+
+
+def send_frame(socket: socket.socket, tag: int, body: bytes) -> None:
+    socket.sendall(frame(tag, body))
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        make_simulation_state(),
+        SimulationStateMessage(),
+        PlayerTextMessage(player_id=uuid4(), text="hello ☃"),
+        PlayerTextMessage(player_id=uuid4(), text=""),
+        ServerJoinMessage(
+            player_id=uuid4(),
+            input_token=bytes(range(INPUT_TOKEN_SIZE)),
+            map_name="dm_s2",
+        ),
+        ServerStatusMessage(status="active"),
+        ServerMapChangeMessage(map_name="dm_blank"),
+    ],
+    ids=lambda message: type(message).__name__,
+)
+def test_message_round_trip(
+    stream_sockets: tuple[socket.socket, socket.socket], message: Message
+) -> None:
+    sender, receiver = stream_sockets
+    network.send(sender, message)
+    assert network.recv(receiver) == message
+
+
+def test_messages_are_read_one_at_a_time(
+    stream_sockets: tuple[socket.socket, socket.socket],
+) -> None:
+    sender, receiver = stream_sockets
+    messages = [
+        ServerStatusMessage(status="active"),
+        make_simulation_state(),
+        ServerMapChangeMessage(map_name="dm_blank"),
+    ]
+    for message in messages:
+        network.send(sender, message)
+
+    assert [network.recv(receiver) for _ in messages] == messages
+
+
+@pytest.mark.parametrize("map_vote", ["dm_s2", None, "é" * (MAX_MAP_VOTE_SIZE // 2)])
+def test_player_state_round_trip(
+    datagram_sockets: tuple[socket.socket, socket.socket], map_vote: str | None
+) -> None:
+    sender, receiver = datagram_sockets
+    player_state = make_player_state(map_vote)
+    network.send_player_state(sender, player_state)
+
+    received_player_state, _ = network.recv_player_state(receiver)
+    assert received_player_state == player_state
+
+
+def test_player_state_with_long_map_vote_is_refused(
+    datagram_sockets: tuple[socket.socket, socket.socket],
+) -> None:
+    sender, _ = datagram_sockets
+    # a cut at the size limit would land in the middle of the last character
+    player_state = make_player_state("a" * (MAX_MAP_VOTE_SIZE - 1) + "é")
+    with pytest.raises(ValueError):
+        network.send_player_state(sender, player_state)
+
+
+def test_unknown_tag(stream_sockets: tuple[socket.socket, socket.socket]) -> None:
+    sender, receiver = stream_sockets
+    send_frame(sender, 255, b"anything")
+    with pytest.raises(UnknownMessageTypeError):
+        network.recv(receiver)
+
+
+@pytest.mark.parametrize(
+    "tag, body",
+    [
+        # simulation state that claims a player but doesn't contain one
+        (1, struct.pack("<HHH", 1, 0, 0)),
+        # too short to hold the counts
+        (1, b"\0"),
+        # too short to hold a uuid
+        (2, b"\0" * 4),
+        # a uuid but no input token
+        (3, b"\0" * 16),
+    ],
+    ids=["missing player", "missing counts", "short uuid", "missing token"],
+)
+def test_short_body(
+    stream_sockets: tuple[socket.socket, socket.socket], tag: int, body: bytes
+) -> None:
+    sender, receiver = stream_sockets
+    send_frame(sender, tag, body)
+    with pytest.raises(MalformedMessageError):
+        network.recv(receiver)
+
+
+@pytest.mark.parametrize(
+    "tag, body",
+    [
+        (2, uuid4().bytes + b"\xff\xfe"),
+        (3, uuid4().bytes + b"\0" * INPUT_TOKEN_SIZE + b"\xc3"),
+        (4, b"\xc3\x28"),
+        (5, b"\x80"),
+    ],
+    ids=["text", "join", "status", "map change"],
+)
+def test_bad_utf8(
+    stream_sockets: tuple[socket.socket, socket.socket], tag: int, body: bytes
+) -> None:
+    sender, receiver = stream_sockets
+    send_frame(sender, tag, body)
+    with pytest.raises(MalformedMessageError):
+        network.recv(receiver)
+
+
+@pytest.mark.parametrize(
+    "malformed_frame",
+    [
+        frame(4, b"\xff"),
+        # not even long enough for a tag
+        struct.pack("<I", 0),
+    ],
+    ids=["bad utf-8", "zero length"],
+)
+def test_framing_survives_malformed_message(
+    stream_sockets: tuple[socket.socket, socket.socket], malformed_frame: bytes
+) -> None:
+    sender, receiver = stream_sockets
+    sender.sendall(malformed_frame)
+    network.send(sender, ServerStatusMessage(status="active"))
+
+    with pytest.raises(MalformedMessageError):
+        network.recv(receiver)
+    assert network.recv(receiver) == ServerStatusMessage(status="active")
+
+
+def test_oversized_message_is_refused_before_reading_body(
+    stream_sockets: tuple[socket.socket, socket.socket],
+) -> None:
+    sender, receiver = stream_sockets
+    # only the length is sent, if recv waited for the body it would time out instead
+    receiver.settimeout(1)
+    sender.sendall(struct.pack("<I", 0xFFFFFFFF))
+    with pytest.raises(MessageTooLargeError):
+        network.recv(receiver)
+
+
+@pytest.mark.parametrize(
+    "datagram",
+    [
+        b"garbage",
+        b"\0" * 200,
+    ],
+    ids=["too short", "too long"],
+)
+def test_malformed_player_state(
+    datagram_sockets: tuple[socket.socket, socket.socket], datagram: bytes
+) -> None:
+    sender, receiver = datagram_sockets
+    sender.send(datagram)
+    with pytest.raises(MalformedMessageError):
+        network.recv_player_state(receiver)
+
+
+def test_player_state_with_bad_utf8_map_vote(
+    datagram_sockets: tuple[socket.socket, socket.socket],
+) -> None:
+    sender, receiver = datagram_sockets
+    network.send_player_state(sender, make_player_state(None))
+    datagram = bytearray(receiver.recv(1024))
+    # the map vote is the last field
+    datagram[-MAX_MAP_VOTE_SIZE:] = b"\xc3" + b"\0" * (MAX_MAP_VOTE_SIZE - 1)
+
+    sender.send(datagram)
+    with pytest.raises(MalformedMessageError):
+        network.recv_player_state(receiver)
@@ -0,0 +1,65 @@
+from pathlib import Path
+from queue import Queue
+
+import pygame
+import pytest
+
+import global_simulation
+import intersections
+import weapons.constants
+from simulation import Simulation
+from simulation_object.player import Player
+from simulation_object.rocket import Rocket
+
+
+@pytest.fixture
+def simulation(monkeypatch: pytest.MonkeyPatch) -> Simulation:
+    # maps are loaded relative to the top of the repository
+    monkeypatch.chdir(Path(__file__).parent.parent)
+    # dm_blank only has walls around its edges
+    simulation = Simulation("dm_blank", Queue())
+    monkeypatch.setattr(global_simulation, "SIMULATION", simulation)
+    return simulation
+
+
+def place_player(simulation: Simulation, position: tuple[float, float]) -> Player:
+    player_id = simulation.add_player()
+    player = simulation.players[player_id]
+    player.position = pygame.math.Vector2(position)
+    return player
+
+
+def test_get_partitions_in_area_ignores_area_outside_map(
+    simulation: Simulation,
+) -> None:
+    partitions = intersections.get_partitions_in_area(simulation.map, -50, -50, 10, 10)
+    assert partitions == [simulation.map.partitioned_map[0][0]]
+
+
+def test_explosion_hits_player_across_partition_seam(simulation: Simulation) -> None:
+    """
+    The victim's centre is just left of the seam at x = 640 while the explosion is right
+    of it, none of the shards that reach the victim cross the seam but one still passes
+    within a player radius of their centre
+    """
+    shooter = place_player(simulation, (200, 200))
+    victim = place_player(simulation, (632, 570))
+
+    simulation.clear_partitions()
+    for player in (shooter, victim):
+        simulation.get_partition(player.position).players.append(player)
+
+    rocket = Rocket(
+        shooter,
+        radius=weapons.constants.ROCKET_RADIUS,
+        speed=weapons.constants.ROCKET_SPEED,
+        direction=pygame.math.Vector2(1, 0),
+        num_shards=weapons.constants.ROCKET_EXPLOSION_SHARDS,
+    )
+    rocket.explode(pygame.math.Vector2(700, 480))
+
+    for hitscan_beam in list(simulation.hitscan_beams.values()):
+        hitscan_beam.step(0)
+
+    assert victim.health < 100
+    assert shooter.health == 100
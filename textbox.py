@@ -11,9 +11,15 @@ class TextInputBox:
         self.text = ""
         self.border_thickness = 2
         self.rect = None
+        self.rendered_text: str | None = None
         self.render_text()
 
     def render_text(self) -> None:
+        # This gets called every frame, but the image only needs to change with the text
+        if self.text == self.rendered_text:
+            return
+        self.rendered_text = self.text
+
         t_surf = self.font.render(self.text, True, self.color, self.backcolor)
         self.image = pygame.Surface(
             (max(self.width, t_surf.get_width() + 10), t_surf.get_height() + 10),